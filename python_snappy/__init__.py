@@ -5,7 +5,24 @@ compression and decompression algorithms.
 """
 
 from .exceptions import CompressionError, SnappyError
-from .snappy import compress, decompress
+from .snappy import compress, decompress, decompress_into, decompress_many, iter_decompress
 
-__all__ = ["compress", "decompress", "CompressionError", "SnappyError"]
+__all__ = [
+    "compress",
+    "decompress",
+    "decompress_into",
+    "decompress_many",
+    "iter_decompress",
+    "CompressionError",
+    "SnappyError",
+]
 __version__ = "0.2.0"
+
+
+def __getattr__(name: str):
+    # decompress_numba needs the optional numba extra; import it on first use
+    if name == "decompress_numba":
+        from ._numba import decompress_numba
+
+        return decompress_numba
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
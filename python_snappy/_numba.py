@@ -0,0 +1,174 @@
+"""Numba-accelerated Snappy decompression.
+
+This module requires the optional ``numba`` and ``numpy`` dependencies
+(``pip install python-snappy-pure[numba]``). It implements the same
+decoder as :mod:`python_snappy.snappy`, compiled to machine code by Numba.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+from .snappy import _decode_error, _decode_varint
+
+# Error codes returned by _decode in place of an output position
+_ERR_TRUNCATED_LITERAL_LENGTH = -1
+_ERR_TRUNCATED_LITERAL = -2
+_ERR_LITERAL_OVERFLOW = -3
+_ERR_TRUNCATED_OFFSET = -4
+_ERR_ZERO_OFFSET = -5
+_ERR_OFFSET_TOO_LARGE = -6
+_ERR_COPY_OVERFLOW = -7
+
+# Short literals and non-overlapping copies move this many bytes at once,
+# which LLVM lowers to unaligned vector loads/stores. The output array has
+# this much slack so a copy may run past the end of its match.
+_WIDE_COPY = 16
+
+# Largest output any element can produce per input byte: a 3-byte copy2
+# element expands to 64 bytes. Bounds the header before allocating.
+_MAX_EXPANSION = 22
+
+# Largest uncompressed length the Snappy format allows
+_MAX_UNCOMPRESSED_LEN = 0xFFFFFFFF
+
+_ERROR_MESSAGES = {
+    _ERR_TRUNCATED_LITERAL_LENGTH: "Truncated literal length",
+    _ERR_TRUNCATED_LITERAL: "Truncated literal data",
+    _ERR_LITERAL_OVERFLOW: "Output overflow in literal",
+    _ERR_TRUNCATED_OFFSET: "Truncated copy offset",
+    _ERR_ZERO_OFFSET: "Invalid zero offset in copy",
+    _ERR_OFFSET_TOO_LARGE: "Copy offset exceeds output position",
+    _ERR_COPY_OVERFLOW: "Output overflow in copy",
+}
+
+
+@njit(cache=True, boundscheck=False, nogil=True)
+def _decode(src, pos, dst, dst_len):
+    """
+    Decode the element stream of src into dst.
+
+    Args:
+        src: Compressed data as a uint8 array
+        pos: Position of the first element (after the length varint)
+        dst: Output uint8 array of dst_len + _WIDE_COPY bytes
+        dst_len: Uncompressed length
+
+    Returns:
+        Number of bytes written, or a negative _ERR_* code
+    """
+    src_len = src.shape[0]
+    out_pos = 0
+
+    while pos < src_len and out_pos < dst_len:
+        tag = np.int64(src[pos])
+        pos += 1
+        element_type = tag & 0x03
+
+        if element_type == 0:  # Literal
+            length = (tag >> 2) + 1
+            if length > 60:
+                extra_bytes = length - 60
+                if pos + extra_bytes > src_len:
+                    return _ERR_TRUNCATED_LITERAL_LENGTH
+                length = 1
+                for i in range(extra_bytes):
+                    length += np.int64(src[pos + i]) << (i * 8)
+                pos += extra_bytes
+
+            if pos + length > src_len:
+                return _ERR_TRUNCATED_LITERAL
+            if out_pos + length > dst_len:
+                return _ERR_LITERAL_OVERFLOW
+
+            if length <= _WIDE_COPY and pos + _WIDE_COPY <= src_len:
+                # Fixed-size copy; bytes past length are overwritten later
+                for i in range(_WIDE_COPY):
+                    dst[out_pos + i] = src[pos + i]
+            else:
+                # A zero-based loop over slice views is vectorised by LLVM;
+                # slice assignment copies through a temporary and is ~40x slower
+                out_view = dst[out_pos : out_pos + length]
+                src_view = src[pos : pos + length]
+                for i in range(length):
+                    out_view[i] = src_view[i]
+            pos += length
+            out_pos += length
+            continue
+
+        if element_type == 1:  # Copy with 1-byte offset
+            length = ((tag >> 2) & 0x07) + 4
+            offset = (tag >> 5) << 8
+            extra_bytes = 1
+        else:  # Copy with 2- or 4-byte offset
+            length = (tag >> 2) + 1
+            offset = 0
+            extra_bytes = 2 if element_type == 2 else 4
+
+        if pos + extra_bytes > src_len:
+            return _ERR_TRUNCATED_OFFSET
+        for i in range(extra_bytes):
+            offset |= np.int64(src[pos + i]) << (i * 8)
+        pos += extra_bytes
+
+        if offset == 0:
+            return _ERR_ZERO_OFFSET
+        if offset > out_pos:
+            return _ERR_OFFSET_TOO_LARGE
+        if out_pos + length > dst_len:
+            return _ERR_COPY_OVERFLOW
+
+        start = out_pos - offset
+        if offset >= _WIDE_COPY:
+            # Each chunk reads only bytes already written, so chunked
+            # copying is safe; it may run up to 15 bytes into the slack
+            for chunk in range(0, length, _WIDE_COPY):
+                for i in range(_WIDE_COPY):
+                    dst[out_pos + chunk + i] = dst[start + chunk + i]
+        else:
+            # Forward byte copy handles overlapping matches correctly
+            for i in range(length):
+                dst[out_pos + i] = dst[start + i]
+        out_pos += length
+
+    return out_pos
+
+
+def decompress_numba(data: bytes) -> bytes:
+    """
+    Decompress Snappy compressed data using a Numba-compiled decoder.
+
+    Produces the same result as :func:`python_snappy.decompress`. The first
+    call compiles the decoder (cached on disk for later processes). The
+    compiled decoder releases the GIL, so :func:`python_snappy.decompress_many`
+    can run it on several threads at once.
+
+    Args:
+        data: Snappy compressed data
+
+    Returns:
+        Decompressed bytes
+
+    Raises:
+        CompressionError: If decompression fails
+    """
+    if not data:
+        return b""
+
+    uncompressed_len, pos = _decode_varint(data, 0)
+    if uncompressed_len > min(len(data) * _MAX_EXPANSION, _MAX_UNCOMPRESSED_LEN):
+        raise _decode_error(
+            f"Uncompressed length {uncompressed_len} is impossible for {len(data)} input bytes"
+        )
+
+    src = np.frombuffer(data, dtype=np.uint8)
+    dst = np.empty(uncompressed_len + _WIDE_COPY, dtype=np.uint8)
+    out_pos = _decode(src, pos, dst, uncompressed_len)
+
+    if out_pos < 0:
+        raise _decode_error(_ERROR_MESSAGES[out_pos])
+    if out_pos != uncompressed_len:
+        raise _decode_error(f"Output size mismatch: expected {uncompressed_len}, got {out_pos}")
+
+    return dst[:uncompressed_len].tobytes()
@@ -5,6 +5,11 @@ This module implements a complete Snappy compressor and decompressor in pure Pyt
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from struct import Struct
+from struct import error as StructError
+
 from .exceptions import CompressionError
 
 # Hash table size for compression (must be power of 2)
@@ -13,6 +18,15 @@ _HASH_TABLE_SIZE = 1 << 14  # 16384 entries
 # Maximum offset for each copy type
 _MAX_OFFSET_1 = 2047  # 11 bits
 _MAX_OFFSET_2 = 65535  # 16 bits
+_MAX_COPY_OFFSET = 0xFFFFFFFF  # 32 bits, the largest a copy4 element can encode
+
+# Fill patterns for offset-1 copies (runs of a single byte value)
+_SINGLE_BYTES = [bytes((i,)) for i in range(256)]
+
+# Little-endian readers for 1-, 2- and 4-byte copy offsets
+_UNPACK_U8 = Struct("<B").unpack_from
+_UNPACK_U16 = Struct("<H").unpack_from
+_UNPACK_U32 = Struct("<I").unpack_from
 
 
 def _encode_varint(value: int) -> bytes:
@@ -203,6 +217,22 @@ def compress(data: bytes) -> bytes:
     return bytes(output)
 
 
+def _decode_error(message: str) -> CompressionError:
+    """
+    Build the CompressionError raised for malformed snappy data.
+
+    Keeps exception construction out of the decoder's bytecode; a fresh
+    instance is returned each time so tracebacks are never shared.
+
+    Args:
+        message: Error description
+
+    Returns:
+        CompressionError tagged with algorithm="snappy"
+    """
+    return CompressionError(message, algorithm="snappy")
+
+
 def _decode_varint(data: bytes, pos: int) -> tuple[int, int]:
     """
     Decode a varint from data starting at pos.
@@ -210,11 +240,22 @@ def _decode_varint(data: bytes, pos: int) -> tuple[int, int]:
     Returns:
         Tuple of (value, new_position)
     """
+    # Fast paths for 1- and 2-byte varints (values below 16384)
+    end = len(data)
+    if pos < end:
+        b0 = data[pos]
+        if b0 < 0x80:
+            return b0, pos + 1
+        if pos + 1 < end:
+            b1 = data[pos + 1]
+            if b1 < 0x80:
+                return (b0 & 0x7F) | (b1 << 7), pos + 2
+
     result = 0
     shift = 0
     while True:
         if pos >= len(data):
-            raise CompressionError("Truncated varint in snappy data", algorithm="snappy")
+            raise _decode_error("Truncated varint in snappy data")
         byte = data[pos]
         pos += 1
         result |= (byte & 0x7F) << shift
@@ -222,10 +263,249 @@ def _decode_varint(data: bytes, pos: int) -> tuple[int, int]:
             break
         shift += 7
         if shift > 32:
-            raise CompressionError("Varint too large in snappy data", algorithm="snappy")
+            raise _decode_error("Varint too large in snappy data")
     return result, pos
 
 
+def _decode_tag(tag: int) -> tuple[int, int, int, int, Callable | None]:
+    """
+    Decode the fixed fields of an element tag byte.
+
+    Args:
+        tag: Tag byte (0-255)
+
+    Returns:
+        Tuple of (element_type, length, offset_high_bits, extra_bytes, unpack_offset).
+        For long literals length is 0 and extra_bytes holds the number of
+        length bytes that follow; for copies extra_bytes is the offset size
+        and unpack_offset reads it. unpack_offset is None for literals.
+    """
+    element_type = tag & 0x03
+    if element_type == 0:  # Literal
+        length = (tag >> 2) + 1
+        if length <= 60:
+            return 0, length, 0, 0, None
+        return 0, 0, 0, length - 60, None
+    if element_type == 1:  # Copy with 1-byte offset
+        # Length: 4-11 (3 bits in tag >> 2) + 4
+        # Offset: 3 bits in tag + 8 bits
+        return 1, ((tag >> 2) & 0x07) + 4, (tag >> 5) << 8, 1, _UNPACK_U8
+    if element_type == 2:  # Copy with 2-byte offset
+        return 2, (tag >> 2) + 1, 0, 2, _UNPACK_U16
+    # Copy with 4-byte offset
+    return 3, (tag >> 2) + 1, 0, 4, _UNPACK_U32
+
+
+# Decoded fields for every possible tag byte, indexed by tag
+_TAG_TABLE = [_decode_tag(tag) for tag in range(256)]
+
+
+def _do_copy(
+    output: bytearray,
+    out_pos: int,
+    offset: int,
+    length: int,
+    out_start: int,
+    out_end: int,
+    max_offset: int,
+    _single_bytes: list[bytes] = _SINGLE_BYTES,
+) -> int:
+    """
+    Resolve a copy element by appending it to the output buffer.
+
+    Args:
+        output: Output buffer, ending at out_pos
+        out_pos: Current output position (len(output))
+        offset: Back-reference offset
+        length: Number of bytes to copy
+        out_start: Position in output where the decoded data starts
+        out_end: Position in output where the decoded data must end
+        max_offset: Largest offset allowed (the streaming window, checked first)
+        _single_bytes: _SINGLE_BYTES, bound as a local for speed (do not pass)
+
+    Returns:
+        New output position
+
+    Raises:
+        CompressionError: If the offset or length is invalid
+    """
+    if offset == 0:
+        raise _decode_error("Invalid zero offset in copy")
+    if offset > max_offset:
+        raise _decode_error(f"Copy offset {offset} exceeds window {max_offset}")
+    if offset > out_pos - out_start:
+        raise _decode_error(f"Copy offset {offset} exceeds output position {out_pos - out_start}")
+    if out_pos + length > out_end:
+        raise _decode_error("Output overflow in copy")
+
+    start = out_pos - offset
+    if offset >= length:
+        # Non-overlapping: a single slice copy
+        output += output[start : start + length]
+    elif offset == 1:
+        # Run of a single byte
+        output += _single_bytes[output[start]] * length
+    else:
+        # Overlapping copy: repeat the pattern until it covers length
+        output += (output[start:] * (length // offset + 1))[:length]
+    return out_pos + length
+
+
+def _decode_elements(
+    data: bytes,
+    pos: int,
+    out: bytearray,
+    out_start: int,
+    out_end: int,
+    flush_at: int,
+    max_offset: int,
+) -> tuple[int, int, int]:
+    """
+    Decode the element stream of data from pos, appending the output to out.
+
+    Stops early once the output reaches flush_at, so a streaming caller can
+    yield and trim out between calls. A literal crossing flush_at is only
+    appended up to it; the caller takes the rest straight from data.
+
+    Args:
+        data: Snappy compressed data (bytes)
+        pos: Position of the next element in data
+        out: Output buffer, ending at the current output position
+        out_start: Position in out where the decoded data starts
+        out_end: Position in out where the decoded data must end
+        flush_at: Output position to stop at (past out_end to decode in full)
+        max_offset: Largest copy offset allowed
+
+    Returns:
+        Tuple of (input position, output position, end of the literal cut
+        short at flush_at, or the input position if none was)
+
+    Raises:
+        CompressionError: If decompression fails
+    """
+    out_pos = len(out)
+
+    # Literals are appended from a memoryview to avoid a temporary copy each
+    view = memoryview(data)
+    end = len(data)
+
+    # Bind module globals to locals for the hot loop
+    tag_table = _TAG_TABLE
+    do_copy = _do_copy
+
+    # Truncated copy offsets surface as struct errors from unpack_offset
+    # rather than being bounds-checked on every copy
+    try:
+        while pos < end and out_pos < out_end:
+            element_type, length, copy_offset, extra_bytes, unpack_offset = tag_table[data[pos]]
+            pos += 1
+
+            if element_type == 0:  # Literal
+                if extra_bytes:
+                    # Length - 1 is encoded in the following 1-4 bytes
+                    if pos + extra_bytes > end:
+                        raise _decode_error("Truncated literal length")
+                    length = int.from_bytes(data[pos : pos + extra_bytes], "little") + 1
+                    pos += extra_bytes
+
+                # Copy literal bytes
+                if pos + length > end:
+                    raise _decode_error("Truncated literal data")
+                if out_pos + length > out_end:
+                    raise _decode_error("Output overflow in literal")
+
+                if out_pos + length >= flush_at:
+                    cut = pos + flush_at - out_pos
+                    out += view[pos:cut]
+                    return cut, flush_at, pos + length
+
+                out += view[pos : pos + length]
+                pos += length
+                out_pos += length
+
+            else:  # Copy with 1-, 2- or 4-byte offset
+                copy_offset |= unpack_offset(data, pos)[0]
+                pos += extra_bytes
+
+                if (
+                    length <= copy_offset <= max_offset
+                    and copy_offset <= out_pos - out_start
+                    and out_pos + length <= out_end
+                ):
+                    # Fast path for the most common element: a valid, non-overlapping copy
+                    start = out_pos - copy_offset
+                    out += out[start : start + length]
+                    out_pos += length
+                else:
+                    out_pos = do_copy(
+                        out, out_pos, copy_offset, length, out_start, out_end, max_offset
+                    )
+
+                if out_pos >= flush_at:
+                    return pos, out_pos, pos
+    except StructError as e:
+        raise _decode_error(f"Truncated copy{extra_bytes} offset") from e
+
+    return pos, out_pos, pos
+
+
+def decompress_into(data: bytes, out: bytearray, offset: int = 0) -> int:
+    """
+    Decompress Snappy compressed data into a caller-provided buffer.
+
+    The decompressed bytes are written to ``out`` starting at ``offset``,
+    replacing anything from ``offset`` onward, so ``out`` ends right after
+    them. Reusing one buffer avoids the final copy made by ``decompress``.
+
+    Args:
+        data: Snappy compressed data
+        out: Output buffer to write into
+        offset: Position in out to start writing at (0 to len(out))
+
+    Returns:
+        Number of decompressed bytes written
+
+    Raises:
+        CompressionError: If decompression fails (out may hold partial output)
+        ValueError: If offset is outside out, or out cannot be resized because
+            a memoryview (or other buffer export) of it is alive
+    """
+    if not 0 <= offset <= len(out):
+        raise ValueError(f"Offset {offset} out of range for buffer of length {len(out)}")
+    try:
+        # Appending probes resizability up front, since truncating at
+        # offset == len(out) is a no-op that succeeds even with exports
+        out.append(0)
+        del out[offset:]
+    except BufferError as e:
+        raise ValueError("Output buffer cannot be resized while a memoryview of it exists") from e
+
+    if not data:
+        return 0
+
+    # Normalise bytes-like input once; non-buffers still raise TypeError
+    if type(data) is not bytes:
+        data = memoryview(data).tobytes()
+    pos = 0
+
+    # Decode uncompressed length
+    uncompressed_len, pos = _decode_varint(data, pos)
+
+    # Output grows by appending, so it is never zero-filled up front. With
+    # flush_at past out_end the decoder runs to the end in one call.
+    out_end = offset + uncompressed_len
+    pos, out_pos, _ = _decode_elements(
+        data, pos, out, offset, out_end, out_end + 1, _MAX_COPY_OFFSET
+    )
+
+    if out_pos != out_end:
+        raise _decode_error(
+            f"Output size mismatch: expected {uncompressed_len}, got {out_pos - offset}"
+        )
+
+    return uncompressed_len
+
+
 def decompress(data: bytes) -> bytes:
     """
     Decompress Snappy compressed data.
@@ -249,121 +529,127 @@ def decompress(data: bytes) -> bytes:
     Raises:
         CompressionError: If decompression fails
     """
+    output = bytearray()
+    decompress_into(data, output)
+    return bytes(output)
+
+
+def iter_decompress(data: bytes, window: int = 65536) -> Iterator[bytes]:
+    """
+    Decompress Snappy compressed data incrementally.
+
+    Yields the output in chunks of ``window`` to ``window + 63`` bytes (the
+    last may be shorter) while keeping only the last ``window`` bytes of
+    output for resolving copies, so memory use is bounded by the window
+    rather than the full uncompressed size. Long literals are yielded
+    straight from the input instead of being buffered. Snappy
+    compressors only reference back within a 64 KiB block, which the default
+    window covers.
+
+    Args:
+        data: Snappy compressed data
+        window: Number of trailing output bytes kept for back-references
+
+    Yields:
+        Consecutive chunks of decompressed bytes
+
+    Raises:
+        CompressionError: If decompression fails or a copy reaches further
+            back than window (chunks before the error have been yielded)
+        ValueError: If window is not positive
+    """
+    if window < 1:
+        raise ValueError(f"Window must be positive, got {window}")
     if not data:
-        return b""
+        return
 
-    pos = 0
+    # Normalise bytes-like input once; non-buffers still raise TypeError
+    if type(data) is not bytes:
+        data = memoryview(data).tobytes()
 
     # Decode uncompressed length
-    uncompressed_len, pos = _decode_varint(data, pos)
+    uncompressed_len, pos = _decode_varint(data, 0)
+
+    view = memoryview(data)
 
-    # Pre-allocate output
-    output = bytearray(uncompressed_len)
+    # Trailing output; out_pos and out_end are positions within it and
+    # shift down whenever the front is dropped
+    history = bytearray()
     out_pos = 0
+    out_end = uncompressed_len
+    emitted = 0
 
-    while pos < len(data) and out_pos < uncompressed_len:
-        tag = data[pos]
-        pos += 1
-        element_type = tag & 0x03
-
-        if element_type == 0:  # Literal
-            # Length encoding depends on upper 6 bits
-            length = (tag >> 2) + 1
-            if length <= 60:
-                # Length is directly encoded (1-60)
-                pass
-            else:
-                # Length is encoded in following bytes
-                extra_bytes = length - 60
-                if pos + extra_bytes > len(data):
-                    raise CompressionError("Truncated literal length", algorithm="snappy")
-                length = 1
-                for i in range(extra_bytes):
-                    length += data[pos + i] << (i * 8)
-                pos += extra_bytes
+    while True:
+        pos, out_pos, lit_end = _decode_elements(
+            data, pos, history, 0, out_end, emitted + window, window
+        )
+        if out_pos < emitted + window:
+            break
 
-            # Copy literal bytes
-            if pos + length > len(data):
-                raise CompressionError("Truncated literal data", algorithm="snappy")
-            if out_pos + length > uncompressed_len:
-                raise CompressionError("Output overflow in literal", algorithm="snappy")
-
-            output[out_pos : out_pos + length] = data[pos : pos + length]
-            pos += length
-            out_pos += length
-
-        elif element_type == 1:  # Copy with 1-byte offset
-            # Length: 4-11 (3 bits in tag >> 2) + 4
-            # Offset: 3 bits in tag + 8 bits
-            length = ((tag >> 2) & 0x07) + 4
-            if pos >= len(data):
-                raise CompressionError("Truncated copy1 offset", algorithm="snappy")
-            offset = ((tag >> 5) << 8) | data[pos]
-            pos += 1
+        yield bytes(history[emitted:])
+
+        # Yield the rest of a cut-short literal straight from the input in
+        # window-sized pieces, so long literals never sit in history in full
+        skipped = 0
+        while lit_end - pos >= window:
+            yield bytes(view[pos : pos + window])
+            pos += window
+            skipped += window
 
-            if offset == 0:
-                raise CompressionError("Invalid zero offset in copy", algorithm="snappy")
-            if offset > out_pos:
-                raise CompressionError(
-                    f"Copy offset {offset} exceeds output position {out_pos}", algorithm="snappy"
-                )
-            if out_pos + length > uncompressed_len:
-                raise CompressionError("Output overflow in copy1", algorithm="snappy")
-
-            # Copy bytes (may overlap)
-            for i in range(length):
-                output[out_pos + i] = output[out_pos - offset + i]
-            out_pos += length
-
-        elif element_type == 2:  # Copy with 2-byte offset
-            # Length: upper 6 bits + 1
-            length = (tag >> 2) + 1
-            if pos + 2 > len(data):
-                raise CompressionError("Truncated copy2 offset", algorithm="snappy")
-            offset = data[pos] | (data[pos + 1] << 8)
-            pos += 2
-
-            if offset == 0:
-                raise CompressionError("Invalid zero offset in copy", algorithm="snappy")
-            if offset > out_pos:
-                raise CompressionError(
-                    f"Copy offset {offset} exceeds output position {out_pos}", algorithm="snappy"
-                )
-            if out_pos + length > uncompressed_len:
-                raise CompressionError("Output overflow in copy2", algorithm="snappy")
-
-            # Copy bytes (may overlap)
-            for i in range(length):
-                output[out_pos + i] = output[out_pos - offset + i]
-            out_pos += length
-
-        else:  # element_type == 3: Copy with 4-byte offset
-            # Length: upper 6 bits + 1
-            length = (tag >> 2) + 1
-            if pos + 4 > len(data):
-                raise CompressionError("Truncated copy4 offset", algorithm="snappy")
-            offset = (
-                data[pos] | (data[pos + 1] << 8) | (data[pos + 2] << 16) | (data[pos + 3] << 24)
-            )
-            pos += 4
-
-            if offset == 0:
-                raise CompressionError("Invalid zero offset in copy", algorithm="snappy")
-            if offset > out_pos:
-                raise CompressionError(
-                    f"Copy offset {offset} exceeds output position {out_pos}", algorithm="snappy"
-                )
-            if out_pos + length > uncompressed_len:
-                raise CompressionError("Output overflow in copy4", algorithm="snappy")
-
-            # Copy bytes (may overlap)
-            for i in range(length):
-                output[out_pos + i] = output[out_pos - offset + i]
-            out_pos += length
-
-    if out_pos != uncompressed_len:
-        raise CompressionError(
-            f"Output size mismatch: expected {uncompressed_len}, got {out_pos}", algorithm="snappy"
+        # Keep only the last window bytes for later copies
+        if skipped:
+            history[:] = view[pos - window : pos]
+        else:
+            del history[: out_pos - window]
+        out_end -= out_pos + skipped - window
+        out_pos = emitted = window
+
+        # The rest of the literal is shorter than window
+        history += view[pos:lit_end]
+        out_pos += lit_end - pos
+        pos = lit_end
+
+    if out_pos != out_end:
+        raise _decode_error(
+            f"Output size mismatch: expected {uncompressed_len}, "
+            f"got {uncompressed_len - (out_end - out_pos)}"
         )
 
-    return bytes(output)
+    if out_pos > emitted:
+        yield bytes(history[emitted:])
+
+
+def decompress_many(
+    blobs: Iterable[bytes],
+    max_workers: int | None = None,
+    decompressor: Callable[[bytes], bytes] | None = None,
+) -> list[bytes]:
+    """
+    Decompress many independent Snappy blobs.
+
+    Without a decompressor the blobs are decoded one after another with
+    ``decompress``: it holds the GIL, so threads would only add overhead.
+    Passing a decompressor that releases the GIL, such as
+    ``decompress_numba``, runs it on a thread pool so blobs decode in
+    parallel.
+
+    Args:
+        blobs: Snappy compressed blobs
+        max_workers: Maximum number of threads (ThreadPoolExecutor default if None);
+            ignored when decoding serially
+        decompressor: GIL-releasing function used for each blob on the thread pool
+
+    Returns:
+        Decompressed bytes for each blob, in input order
+
+    Raises:
+        CompressionError: If any blob fails to decompress
+    """
+    if decompressor is None:
+        decompressor = decompress
+    if decompressor is decompress or max_workers == 1:
+        # Nothing to parallelise; a thread pool would only add overhead
+        return [decompressor(blob) for blob in blobs]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(decompressor, blobs))
@@ -198,6 +198,44 @@ class TestSnappyRoundTrip:
         original = b"START" + b"A" * 1000 + b"MIDDLE" + b"B" * 1000 + b"END"
         assert decompress(compress(original)) == original
 
+    def test_roundtrip_into(self, compress):
+        """Test decompressing into a caller-provided buffer at an offset."""
+        from python_snappy import decompress_into
+
+        original = b"ABCDEFGH" * 1000
+        out = bytearray(b"prefix-and-stale-data")
+        written = decompress_into(compress(original), out, offset=7)
+        assert written == len(original)
+        assert out == b"prefix-" + original
+
+    def test_roundtrip_iter(self, compress):
+        """Test streaming decompression yields the full output in chunks."""
+        from python_snappy import iter_decompress
+
+        original = b"START" + bytes(range(256)) * 1000 + b"X" * 100000 + b"END"
+        chunks = list(iter_decompress(compress(original)))
+        assert len(chunks) > 1
+        assert b"".join(chunks) == original
+
+    def test_roundtrip_iter_random_like_data(self, compress):
+        """Test streaming keeps chunks near the window when literals are long."""
+        import hashlib
+
+        from python_snappy import iter_decompress
+
+        original = b"".join(hashlib.sha512(str(i).encode()).digest() for i in range(5000))
+        window = 65536
+        chunks = list(iter_decompress(compress(original), window=window))
+        assert max(len(c) for c in chunks) <= window + 64
+        assert b"".join(chunks) == original
+
+    def test_roundtrip_many(self, compress):
+        """Test batch decompression preserves input order."""
+        from python_snappy import decompress_many
+
+        originals = [b"", b"Hello, World!", b"AB" * 500, bytes(range(256)) * 10]
+        assert decompress_many([compress(o) for o in originals], max_workers=2) == originals
+
 
 class TestSnappyDecompression:
     """Test pure Python snappy decompression against python-snappy library."""
@@ -378,6 +416,12 @@ class TestSnappyEdgeCases:
         result = custom_snappy(compressed)
         assert result == original
 
+    def test_overlapping_copy_partial_pattern(self, custom_snappy):
+        """Test overlapping copy whose length is not a multiple of the offset."""
+        # Length 11, literal "abc", copy1 with offset 3 and length 8
+        compressed = b"\x0b\x08abc\x11\x03"
+        assert custom_snappy(compressed) == b"abcabcabcab"
+
     def test_mixed_literals_and_copies(self, snappy_lib, custom_snappy):
         """Test interleaved literals and various copy types."""
         # Create data that mixes unique and repeated sections
@@ -396,6 +440,15 @@ class TestSnappyErrorHandling:
 
         return decompress
 
+    def test_non_buffer_input(self, custom_snappy):
+        """Test non-buffer input raises TypeError instead of being coerced."""
+        from python_snappy import iter_decompress
+
+        with pytest.raises(TypeError):
+            custom_snappy(5)
+        with pytest.raises(TypeError):
+            list(iter_decompress(5))
+
     def test_truncated_varint(self, custom_snappy):
         """Test handling of truncated varint."""
         from python_snappy import CompressionError
@@ -411,3 +464,167 @@ class TestSnappyErrorHandling:
         # Varint says 10 bytes, but only header present
         with pytest.raises(CompressionError):
             custom_snappy(b"\x0a\x04")  # length 10, literal tag for 2 bytes
+
+    def test_truncated_copy_offset(self, custom_snappy):
+        """Test handling of a copy tag missing its offset bytes."""
+        from python_snappy import CompressionError
+
+        # Length 5, literal "a", then a copy2 tag with no offset
+        with pytest.raises(CompressionError) as exc_info:
+            custom_snappy(b"\x05\x00a\x02")
+        assert exc_info.value.algorithm == "snappy"
+
+    def test_copy_before_output_offset(self):
+        """Test copies cannot reach back into data before the output offset."""
+        from python_snappy import CompressionError, decompress_into
+
+        # Length 5, copy1 with offset 1 but nothing decoded yet
+        with pytest.raises(CompressionError):
+            decompress_into(b"\x05\x01\x01", bytearray(b"xyz"), offset=3)
+
+    @pytest.mark.parametrize("offset", [0, 3])
+    def test_decompress_into_exported_buffer(self, offset):
+        """Test decompressing into a buffer with a live memoryview is rejected."""
+        from python_snappy import compress, decompress_into
+
+        out = bytearray(b"abc")
+        view = memoryview(out)
+        with pytest.raises(ValueError):
+            decompress_into(compress(b"Hello, World!"), out, offset=offset)
+        assert out == b"abc"
+        view.release()
+
+    def test_iter_copy_beyond_window(self):
+        """Test streaming decompression rejects copies outside the window."""
+        from python_snappy import CompressionError, compress, iter_decompress
+
+        # Repeats at offset 256 cannot be resolved from a 100 byte window
+        with pytest.raises(CompressionError, match="exceeds window 100"):
+            list(iter_decompress(compress(bytes(range(256)) * 10), window=100))
+
+    def test_iter_copy_beyond_window_after_trim(self):
+        """Test window errors report the window once history has been trimmed."""
+        import hashlib
+
+        from python_snappy import CompressionError, compress, iter_decompress
+
+        # Copies at offset 320 follow a 320 byte literal already trimmed to the window
+        block = b"".join(hashlib.sha512(bytes([i])).digest() for i in range(5))
+        compressed = compress(block * 20)
+        with pytest.raises(CompressionError, match="exceeds window 100"):
+            list(iter_decompress(compressed, window=100))
+
+
+class TestSnappyNumba:
+    """Test the Numba-compiled decompressor against the pure Python one."""
+
+    @pytest.fixture
+    def numba_decompress(self):
+        """Get the Numba decompression function, skip if numba is not available."""
+        try:
+            from python_snappy import decompress_numba
+
+            return decompress_numba
+        except ImportError:
+            pytest.skip("numba not installed")
+
+    @pytest.fixture
+    def compress(self):
+        from python_snappy import compress
+
+        return compress
+
+    @pytest.fixture
+    def decompress(self):
+        from python_snappy import decompress
+
+        return decompress
+
+    @pytest.mark.parametrize(
+        "original",
+        [
+            b"",
+            b"Hello, World!",
+            b"AB" * 500,
+            b"X" * 100000,
+            bytes(range(256)) * 10,
+            bytes(range(20)) * 50,
+            bytes(range(24)) * 40,
+            b"START" + b"A" * 1000 + b"MIDDLE" + b"B" * 1000 + b"END",
+        ],
+    )
+    def test_roundtrip(self, numba_decompress, compress, decompress, original):
+        """Test Numba decompression of our own compressed output."""
+        compressed = compress(original)
+        assert numba_decompress(compressed) == decompress(compressed) == original
+
+    def test_chunked_overlapping_copy(self, numba_decompress, decompress):
+        """Test a copy with 16 <= offset < length, copied in 16-byte chunks."""
+        # 20-byte literal, then a copy2 of length 50 at offset 20
+        compressed = b"\x46\x4c" + bytes(range(20)) + b"\xc6\x14\x00"
+        expected = bytes(range(20)) * 3 + bytes(range(10))
+        assert numba_decompress(compressed) == decompress(compressed) == expected
+
+    @pytest.mark.parametrize("tail_length", [15, 16, 17])
+    def test_trailing_literal(self, numba_decompress, decompress, tail_length):
+        """Test literals ending the stream on either side of the wide copy bound."""
+        tail = bytes(range(65, 65 + tail_length))
+        # "abcd" literal, copy1 of length 4 at offset 4, then the trailing literal
+        compressed = (
+            bytes([8 + tail_length, 0x0C])
+            + b"abcd"
+            + b"\x01\x04"
+            + bytes([(tail_length - 1) << 2])
+            + tail
+        )
+        expected = b"abcdabcd" + tail
+        assert numba_decompress(compressed) == decompress(compressed) == expected
+
+    @pytest.mark.parametrize("next_length", [9, 10])
+    def test_short_literal_near_end(self, numba_decompress, decompress, next_length):
+        """Test a short literal whose 16-byte copy ends at or past the end of input."""
+        following = bytes(range(48, 48 + next_length))
+        # 5-byte literal followed by one more literal element; with 10 bytes the
+        # first literal's 16-byte window ends exactly at the end of input
+        compressed = (
+            bytes([5 + next_length, 0x10])
+            + b"hello"
+            + bytes([(next_length - 1) << 2])
+            + following
+        )
+        expected = b"hello" + following
+        assert numba_decompress(compressed) == decompress(compressed) == expected
+
+    def test_overlapping_copy_partial_pattern(self, numba_decompress):
+        """Test overlapping copy whose length is not a multiple of the offset."""
+        assert numba_decompress(b"\x0b\x08abc\x11\x03") == b"abcabcabcab"
+
+    @pytest.mark.parametrize(
+        "corrupted",
+        [
+            b"\xc8\xbc\xbe\xcbB\xfe\x02\x00",
+            b"\x98\xdf\xe9\xc9ello",
+            b"\x80\xa1\xf0\xff>\x01\x02\x03",
+        ],
+    )
+    def test_oversized_length_header(self, numba_decompress, corrupted):
+        """Test corrupted length headers raise instead of allocating gigabytes."""
+        from python_snappy import CompressionError
+
+        with pytest.raises(CompressionError):
+            numba_decompress(corrupted)
+
+    def test_decompress_many(self, numba_decompress, compress):
+        """Test batch decompression with the Numba decompressor."""
+        from python_snappy import decompress_many
+
+        originals = [b"X" * 100000, b"Hello, World!" * 50, b"AB" * 500]
+        compressed = [compress(o) for o in originals]
+        assert decompress_many(compressed, decompressor=numba_decompress) == originals
+
+    def test_truncated_copy_offset(self, numba_decompress):
+        """Test handling of a copy tag missing its offset bytes."""
+        from python_snappy import CompressionError
+
+        with pytest.raises(CompressionError):
+            numba_decompress(b"\x05\x00a\x02")